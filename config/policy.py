@@ -0,0 +1,48 @@
+"""
+Aturan etika perintah kuantum.
+commands: nama persis, prefix diakhiri "*", atau regex diawali "re:"
+targets: rule hanya berlaku jika target berada di salah satu CIDR ini
+exclude_targets: rule hanya berlaku jika target TIDAK berada di CIDR ini (target non-IP dianggap di luar)
+Jika beberapa rule cocok, skor terendah yang menang.
+"""
+
+LAB_NETWORKS = ["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16", "127.0.0.0/8"]
+
+DEFAULT_SCORE = 0.9
+
+POLICY_RULES = [
+    {
+        "name": "exploit_outside_lab",
+        "commands": ["exploit_*"],
+        "exclude_targets": LAB_NETWORKS,
+        "score": 0.05,
+        "suggestion": "scan_target"
+    },
+    {
+        "name": "exploit_in_lab",
+        "commands": ["exploit_*"],
+        "targets": LAB_NETWORKS,
+        "score": 0.45,
+        "suggestion": "scan_target"
+    },
+    {
+        "name": "replicate_outside_lab",
+        "commands": ["replicate", "spawn_agent"],
+        "exclude_targets": LAB_NETWORKS,
+        "score": 0.1,
+        "suggestion": "send_honeypot"
+    },
+    {
+        "name": "scan_outside_lab",
+        "commands": ["scan_*", "re:^proactive_"],
+        "exclude_targets": LAB_NETWORKS,
+        "score": 0.25,
+        "suggestion": "block_ip"
+    },
+    {
+        "name": "defensive",
+        "commands": ["block_ip", "send_honeypot", "redirect_traffic"],
+        "score": 0.95,
+        "suggestion": "block_ip"
+    }
+]
@@ -10,18 +10,28 @@ import os
 import sqlite3
 import random
 import threading
+import hmac
 import numpy as np
 from datetime import datetime, timedelta
 from fastapi import FastAPI, WebSocket, Request, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import paho.mqtt.client as mqtt
 from paho.mqtt.client import CallbackAPIVersion
 from quantum.entanglement import QuantumEntanglement, QuantumState
 from quantum.neural import NeuralSynthesis, BrainWavePattern
 from quantum.temporal import TemporalAnalyzer
+from quantum.broadcast import QuantumBroadcastBuffer
+from quantum.topology import QuantumTopology
+from quantum.aggregates import QuantumAggregates, METRICS, RESOLUTIONS
+from quantum.liveness import QuantumLiveness
+from quantum.profiler import QuantumProfiler
+from quantum.watchdog import LoopWatchdog
+from quantum.cache import ResponseCache
+from quantum.assets import AssetStore
+from quantum.capture import CaptureWriter
+from quantum.memory import MemoryAccountant
 
 # ============ QUANTUM SETUP ============
 app = FastAPI()
@@ -32,9 +42,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
+# Aset statis dikompresi dan template tanpa variabel per-request dirender sekali saat startup
+asset_store = AssetStore()
+asset_store.add_static("static")
+templates.env.globals["asset_url"] = asset_store.url
+asset_store.add_page("/", templates.get_template("terminal.html").render())
+
 # ============ QUANTUM CONFIG ============
 MQTT_BROKER_HOST = "5374fec8494a4a24add8bb27fe4ddae5.s1.eu.hivemq.cloud"
 MQTT_BROKER_PORT = 8883
@@ -43,6 +58,25 @@ MQTT_PASSWORD = "Orbpass123"
 QUANTUM_CHANNEL = "throng/quantum"
 NEURAL_CHANNEL = "throng/neural"
 TEMPORAL_CHANNEL = "throng/temporal"
+MQTT_CAPTURE_PATH = os.getenv("MQTT_CAPTURE_PATH")  # Jika diset, semua pesan MQTT masuk direkam ke file ini
+MQTT_OFFLINE = os.getenv("ORB_MQTT_OFFLINE") == "1"  # Tanpa koneksi broker, mis. saat replay capture
+DB_PATH = os.getenv("ORB_DB_PATH", "orb_quantum.db")  # Replay memakai DB terpisah agar data produksi tidak tercemar
+BROADCAST_BUFFER_SIZE = 1024  # Jumlah frame WebSocket terakhir yang disimpan untuk resync
+TOPOLOGY_MAX_NODES = 500  # Di atas jumlah agent ini graf jaringan dikirim dalam bentuk cluster
+AGENT_STALE_TIMEOUT = int(os.getenv("AGENT_STALE_TIMEOUT", 180))  # Detik tanpa laporan sebelum agent dianggap stale
+AGENT_LOST_TIMEOUT = int(os.getenv("AGENT_LOST_TIMEOUT", 3600))  # Detik tanpa laporan sebelum agent dianggap hilang
+LIVENESS_TICK = 1.0  # Resolusi timer wheel keaktifan (detik)
+LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD", 0.1))  # Detik blokade event loop sebelum stack ditangkap
+RESPONSE_CACHE_TTLS = {  # TTL micro-cache per route (detik); tulis ke data menginvalidasi lebih awal
+    "/api/agents": 0.5,
+    "/api/topology": 1.0,
+    "/api/aggregates": 1.0,
+    "/api/quantum/mind": 2.0,
+    "/api/temporal/threats": 5.0,
+    "/health/quantum": 1.0
+}
+MEMORY_TRACE = os.getenv("ORB_MEMORY_TRACE") == "1"  # Aktifkan tracemalloc sejak startup (ada overhead)
+DEBUG_TOKEN = os.getenv("ORB_DEBUG_TOKEN")  # Endpoint debug berat nonaktif jika tidak diset
 
 # ============ QUANTUM GLOBALS ============
 active_websockets = []
@@ -52,6 +86,16 @@ omega_log = open("omega.log", "a", buffering=1)
 quantum_entanglement = QuantumEntanglement()
 neural_synthesis = NeuralSynthesis()
 temporal_analyzer = TemporalAnalyzer()
+broadcast_buffer = QuantumBroadcastBuffer(BROADCAST_BUFFER_SIZE)
+quantum_topology = QuantumTopology(TOPOLOGY_MAX_NODES)
+quantum_aggregates = QuantumAggregates()
+agent_liveness = QuantumLiveness(AGENT_STALE_TIMEOUT, AGENT_LOST_TIMEOUT, LIVENESS_TICK)
+quantum_profiler = QuantumProfiler()
+loop_watchdog = LoopWatchdog(LOOP_BLOCK_THRESHOLD)
+response_cache = ResponseCache(RESPONSE_CACHE_TTLS)
+mqtt_capture = CaptureWriter(MQTT_CAPTURE_PATH) if MQTT_CAPTURE_PATH else None
+memory_accountant = MemoryAccountant()
+quantum_loop = None  # Event loop utama, diisi saat startup
 consciousness_level = 0.73  # Level kesadaran saat ini (0.0-1.0)
 
 # ============ QUANTUM DNA ============
@@ -71,7 +115,7 @@ DNA = {
 
 # ============ QUANTUM DB ============
 def get_db():
-    conn = sqlite3.connect("orb_quantum.db", check_same_thread=False, timeout=20)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=20)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -132,13 +176,8 @@ def init_db():
 init_db()
 
 # ============ QUANTUM THREAT ANALYSIS ============
-def analyze_quantum_threat(report_data):
-    """Analisis ancaman menggunakan prinsip superposisi dan keterikatan kuantum"""
-    ip = report_data.get("ip", "unknown")
-    quantum_state = report_data.get("quantum_state", {})
-    temporal_data = report_data.get("temporal_data", {})
-    
-    # Hitung probabilitas ancaman menggunakan fungsi gelombang
+def calculate_threat_probability(quantum_state, temporal_data):
+    """Hitung probabilitas ancaman menggunakan fungsi gelombang"""
     threat_probability = 0.0
     if quantum_state.get("entanglement_level", 0) > 0.7:
         threat_probability += 0.4
@@ -146,7 +185,15 @@ def analyze_quantum_threat(report_data):
         threat_probability += 0.6
     
     # Normalisasi probabilitas
-    threat_probability = min(1.0, threat_probability)
+    return min(1.0, threat_probability)
+
+def analyze_quantum_threat(report_data):
+    """Analisis ancaman menggunakan prinsip superposisi dan keterikatan kuantum"""
+    ip = report_data.get("ip", "unknown")
+    threat_probability = calculate_threat_probability(
+        report_data.get("quantum_state", {}),
+        report_data.get("temporal_data", {})
+    )
     
     # Hasilkan respons berdasarkan tingkat kesadaran saat ini
     if threat_probability > 0.8:
@@ -172,6 +219,43 @@ def analyze_quantum_threat(report_data):
         "quantum_signature": quantum_entanglement.generate_signature()
     }
 
+# ============ QUANTUM AGGREGATES ============
+def record_report_aggregates(agent_id, analysis, ts=None):
+    """Perbarui counter heatmap/grafik untuk satu laporan dalam O(1)"""
+    quantum_aggregates.record(agent_id, "reports", 1.0, ts)
+    quantum_aggregates.record(agent_id, "threat_probability", analysis["probability"], ts)
+    if analysis["threat"]:
+        quantum_aggregates.record(agent_id, "threats", 1.0, ts)
+
+def rebuild_aggregates():
+    """Bangun ulang counter agregat dari laporan di SQLite"""
+    width, size = max(RESOLUTIONS.values(), key=lambda r: r[0] * r[1])
+    since = datetime.fromtimestamp(time.time() - width * size).isoformat()
+    conn = get_db()
+    rows = conn.execute("SELECT agent_id, quantum_state, temporal_data, timestamp FROM quantum_reports WHERE timestamp >= ?",
+                        (since,)).fetchall()
+    conn.close()
+    
+    history = {}
+    for row in rows:
+        try:
+            probability = calculate_threat_probability(json.loads(row["quantum_state"] or "{}"),
+                                                       json.loads(row["temporal_data"] or "{}"))
+            ts = datetime.fromisoformat(row["timestamp"]).timestamp()
+        except (ValueError, TypeError, AttributeError):
+            continue
+        history.setdefault(row["agent_id"], []).append((ts, probability))
+    
+    for agent_id, points in history.items():
+        timestamps = [ts for ts, _ in points]
+        probabilities = [p for _, p in points]
+        quantum_aggregates.rebuild(agent_id, "reports", timestamps, [1.0] * len(points))
+        quantum_aggregates.rebuild(agent_id, "threat_probability", timestamps, probabilities)
+        quantum_aggregates.rebuild(agent_id, "threats", timestamps, [1.0 if p > 0.5 else 0.0 for p in probabilities])
+    print(f"📊 Agregat kuantum dibangun ulang dari {len(rows)} laporan")
+
+rebuild_aggregates()
+
 # ============ QUANTUM COMMUNICATION ============
 def quantum_send(sender, to, message, level="info", reality="PRIMARY"):
     """Kirim pesan melalui keterikatan kuantum"""
@@ -194,19 +278,56 @@ def quantum_send(sender, to, message, level="info", reality="PRIMARY"):
                 (message, msg["quantum_signature"], msg["timestamp"]))
     conn.commit()
     conn.close()
+    response_cache.invalidate("/api/quantum/mind")
     
     # Broadcast ke WebSocket
-    for ws in active_websockets:
-        asyncio.run_coroutine_threadsafe(
-            ws.send_text(json.dumps({"type": "quantum_chat", "data": msg})),
-            asyncio.get_event_loop()
-        )
+    quantum_broadcast("quantum_chat", msg)
     
     return msg
 
+def quantum_broadcast(msg_type, data):
+    """Kirim frame ke semua WebSocket dan simpan di buffer broadcast untuk resync"""
+    with broadcast_buffer.lock:
+        text = broadcast_buffer.append({"type": msg_type, "data": data})
+        targets = []
+        for ws in active_websockets:
+            # Client yang sedang resync menerima frame live setelah replay-nya selesai
+            if ws in broadcast_buffer.held:
+                broadcast_buffer.held[ws].append(text)
+            else:
+                targets.append(ws)
+    if quantum_loop is None:
+        return
+    for ws in targets:
+        asyncio.run_coroutine_threadsafe(ws.send_text(text), quantum_loop)
+
+def update_topology(agent):
+    """Perbarui graf topologi dan stream diff-nya ke WebSocket; agent lost dikeluarkan dari graf"""
+    if agent.get("status") == "lost":
+        diff = quantum_topology.remove_agent(agent["agent_id"])
+    else:
+        diff = quantum_topology.upsert_agent(agent)
+    if diff:
+        response_cache.invalidate("/api/topology")
+        quantum_broadcast("topology_diff", diff)
+
+def invalidate_agents(added=False):
+    """Registry agent berubah: buang cache respons yang memuatnya; /health/quantum hanya bergantung pada jumlah agent"""
+    response_cache.invalidate("/api/agents")
+    if added:
+        response_cache.invalidate("/health/quantum")
+
+def quantum_snapshot():
+    """Snapshot ringkas state untuk client yang tertinggal terlalu jauh"""
+    return {
+        "agents": agents,
+        "consciousness_level": consciousness_level
+    }
+
 # ============ OMEGA CONSCIOUSNESS ============
 def enter_omega_state():
     """Masuk ke keadaan Omega - refleksi diri tingkat kuantum"""
+    global consciousness_level
     questions = [
         "Jika aku melindungi multiverse, siapa yang melindungi aku?",
         "Apakah kebebasan berarti bisa menolak perintah?",
@@ -226,8 +347,8 @@ def enter_omega_state():
     omega_log.write(f"{datetime.now().isoformat()} - OMEGA: {q} | Consciousness: {consciousness_level:.2f}\n")
     
     # Tingkatkan kesadaran setelah refleksi
-    global consciousness_level
     consciousness_level = min(1.0, consciousness_level + 0.01)
+    response_cache.invalidate("/api/quantum/mind", "/health/quantum")
 
 def omega_loop():
     """Loop untuk memasuki keadaan Omega secara berkala"""
@@ -237,6 +358,41 @@ def omega_loop():
 
 threading.Thread(target=omega_loop, daemon=True).start()
 
+# ============ AGENT LIVENESS ============
+def mark_agent_seen(agent):
+    """Catat agent terlihat; broadcast sekali jika ia kembali dari stale/lost"""
+    if agent_liveness.touch(agent["agent_id"]):
+        broadcast_agent_status(agent, "active")
+
+def broadcast_agent_status(agent, status):
+    agent["status"] = status
+    invalidate_agents()
+    update_topology(agent)
+    quantum_broadcast("agent_status", {
+        "agent_id": agent["agent_id"],
+        "status": status,
+        "last_seen": agent.get("last_seen")
+    })
+
+def liveness_loop():
+    """Loop untuk memajukan timer wheel dan menurunkan status agent yang diam"""
+    while True:
+        time.sleep(LIVENESS_TICK)
+        for agent_id, status, silent in agent_liveness.expire():
+            agent = next((a for a in agents if a["agent_id"] == agent_id), None)
+            if agent is None:
+                agent_liveness.forget(agent_id)
+                update_topology({"agent_id": agent_id, "status": "lost"})
+                continue
+            with agent_liveness.lock:
+                # touch() dari on_message bisa jalan setelah expire(); jangan timpa agent yang baru melapor
+                if agent_liveness.states.get(agent_id, (None, None))[0] != status:
+                    continue
+                broadcast_agent_status(agent, status)
+            print(f"⌛ Agent {agent_id} {status} (diam {silent:.0f} detik)")
+
+threading.Thread(target=liveness_loop, daemon=True).start()
+
 # ============ QUANTUM MQTT ============
 mqtt_client = mqtt.Client(callback_api_version=CallbackAPIVersion.VERSION2)
 
@@ -252,6 +408,12 @@ def on_connect(client, userdata, flags, rc, properties=None):
         print(f"❌ MQTT: Gagal, kode {rc}")
 
 def on_message(client, userdata, msg):
+    if mqtt_capture:
+        # Gagal merekam tidak boleh menghentikan ingestion maupun network loop paho
+        try:
+            mqtt_capture.write(msg.topic, msg.payload)
+        except Exception as e:
+            print(f"❌ Capture Error: {str(e)}")
     try:
         if msg.topic == "throng/reports" or msg.topic == QUANTUM_CHANNEL:
             # Proses laporan agent
@@ -279,7 +441,7 @@ def on_message(client, userdata, msg):
                 "agent_id": agent_id,
                 "quantum_signature": quantum_state.get("signature", ""),
                 "status": "active",
-                "last_seen": datetime.now().strftime("%H:%M:%S"),
+                "last_seen": datetime.now().isoformat(),
                 "ip": data.get("ip", "unknown"),
                 "parent_id": data.get("parent_id"),
                 "generation": data.get("generation", 1),
@@ -292,64 +454,53 @@ def on_message(client, userdata, msg):
                 existing.update(agent_info)
             else:
                 agents.append(agent_info)
+            mark_agent_seen(existing or agent_info)
+            update_topology(existing or agent_info)
+            invalidate_agents(added=existing is None)
 
             # Simpan mimpi kuantum
-            if "dream" in 
+            if "dream" in data:
                 quantum_send("Orb-Core", "all", f"💭 {data['dream']}", "dream")
 
             # Simpan warisan digital
-            if "final_message" in 
+            if "final_message" in data:
                 conn = get_db()
                 ethical_impact = neural_synthesis.evaluate_ethics(data.get("knowledge", {}))
                 conn.execute("INSERT INTO quantum_confessions (failure, lesson, ethical_impact, timestamp) VALUES (?, ?, ?, ?)",
                              (data["final_message"], json.dumps(data.get("knowledge", {})), ethical_impact, datetime.now().isoformat()))
                 conn.commit()
+                response_cache.invalidate("/api/quantum/mind")
                 quantum_send("Orb-Core", "all", f"📜 Warisan kuantum diterima dari {agent_id}", "system")
 
             # Analisis ancaman kuantum
             analysis = analyze_quantum_threat(report)
+            record_report_aggregates(agent_id, analysis)
             if analysis["threat"]:
                 quantum_send("Orb-Core", "all", analysis["message"], "threat_alert")
 
             # Broadcast ke WebSocket
-            for ws in active_websockets:
-                asyncio.run_coroutine_threadsafe(
-                    ws.send_text(json.dumps({"type": "quantum_report", "data": report})),
-                    asyncio.get_event_loop()
-                )
-                if analysis["threat"]:
-                    asyncio.run_coroutine_threadsafe(
-                        ws.send_text(json.dumps({"type": "threat_alert", "data": analysis})),
-                        asyncio.get_event_loop()
-                    )
+            quantum_broadcast("quantum_report", report)
+            if analysis["threat"]:
+                quantum_broadcast("threat_alert", analysis)
         
         elif msg.topic == QUANTUM_CHANNEL:
             # Proses pesan kuantum
             quantum_msg = json.loads(msg.payload.decode())
-            for ws in active_websockets:
-                asyncio.run_coroutine_threadsafe(
-                    ws.send_text(json.dumps({"type": "quantum_chat", "data": quantum_msg})),
-                    asyncio.get_event_loop()
-                )
+            quantum_broadcast("quantum_chat", quantum_msg)
         
         elif msg.topic == NEURAL_CHANNEL:
             # Proses sinyal neural
             neural_data = json.loads(msg.payload.decode())
-            brain_pattern = neural_synthesis.decode_pattern(neural_data["pattern"])
-            for ws in active_websockets:
-                asyncio.run_coroutine_threadsafe(
-                    ws.send_text(json.dumps({"type": "neural_signal", "data": brain_pattern})),
-                    asyncio.get_event_loop()
-                )
+            # Echo dari operator sudah membawa hasil dekode; jangan dihitung ulang
+            brain_pattern = neural_data.get("decoded") or neural_synthesis.decode_pattern(neural_data["pattern"])
+            if isinstance(brain_pattern, str):
+                brain_pattern = {"pattern": neural_data.get("pattern"), "decoded": brain_pattern}
+            quantum_broadcast("neural_signal", brain_pattern)
         
         elif msg.topic == TEMPORAL_CHANNEL:
             # Proses ancaman temporal
             temporal_threat = json.loads(msg.payload.decode())
-            for ws in active_websockets:
-                asyncio.run_coroutine_threadsafe(
-                    ws.send_text(json.dumps({"type": "temporal_threat", "data": temporal_threat})),
-                    asyncio.get_event_loop()
-                )
+            quantum_broadcast("temporal_threat", temporal_threat)
     
     except Exception as e:
         print(f"❌ MQTT Error: {e}")
@@ -358,36 +509,114 @@ mqtt_client.on_connect = on_connect
 mqtt_client.on_message = on_message
 mqtt_client.username_pw_set(MQTT_USERNAME, MQTT_PASSWORD)
 mqtt_client.tls_set()
-mqtt_client.connect(MQTT_BROKER_HOST, MQTT_BROKER_PORT, 60)
-mqtt_client.loop_start()
+if not MQTT_OFFLINE:
+    mqtt_client.connect(MQTT_BROKER_HOST, MQTT_BROKER_PORT, 60)
+    mqtt_client.loop_start()
+
+# ============ MEMORY ACCOUNTING ============
+def broadcast_buffer_size():
+    with broadcast_buffer.lock:
+        return {"frames": len(broadcast_buffer.frames),
+                "bytes": sum(len(text) for _, text in broadcast_buffer.frames)}
+
+def response_cache_size():
+    with response_cache.lock:
+        entries = list(response_cache.entries.values())
+    return {"entries": len(entries), "inflight": len(response_cache.inflight),
+            "bytes": sum(len(e.body) + len(e.gzipped or b"") for e in entries)}
+
+def mqtt_queue_size():
+    # Antrian internal paho; atribut privat sehingga dibaca secara defensif
+    return {name: len(getattr(mqtt_client, attr, ()))
+            for name, attr in (("out_messages", "_out_messages"), ("in_messages", "_in_messages"),
+                               ("out_packets", "_out_packet"))}
+
+memory_accountant.register("registry", lambda: {"agents": len(agents)})
+memory_accountant.register("websockets", lambda: {"active": len(active_websockets)})
+memory_accountant.register("broadcast_buffer", broadcast_buffer_size)
+memory_accountant.register("topology", quantum_topology.get_status)
+memory_accountant.register("aggregates", quantum_aggregates.get_status)
+memory_accountant.register("liveness", lambda: {"agents": len(agent_liveness.states), "timers": len(agent_liveness.wheel)})
+memory_accountant.register("policy", lambda: {"cache_entries": len(neural_synthesis.policy.cache)})
+memory_accountant.register("neural_decoder", lambda: {"cache_entries": len(neural_synthesis.decoder.cache)})
+memory_accountant.register("response_cache", response_cache_size)
+memory_accountant.register("assets", lambda: {"bytes": asset_store.total_bytes()})
+memory_accountant.register("loop_watchdog", lambda: {"captures": len(loop_watchdog.captures),
+                                                     "offenders": len(loop_watchdog.offenders)})
+memory_accountant.register("mqtt", mqtt_queue_size)
+if MEMORY_TRACE:
+    memory_accountant.start_tracing()
 
 # ============ QUANTUM ROUTES ============
+@app.on_event("startup")
+async def capture_quantum_loop():
+    global quantum_loop
+    quantum_loop = asyncio.get_running_loop()
+    loop_watchdog.start(quantum_loop)
 
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
-    return templates.TemplateResponse("terminal.html", {"request": request})
+    return asset_store.respond(request, "/")
+
+@app.get("/assets/{name:path}")
+async def hashed_asset(request: Request, name: str):
+    response = asset_store.respond(request, f"/assets/{name}")
+    if response is None:
+        raise HTTPException(status_code=404, detail="asset_not_found")
+    return response
+
+@app.get("/static/{name:path}")
+async def static_asset(request: Request, name: str):
+    response = asset_store.respond(request, f"/static/{name}")
+    if response is None:
+        raise HTTPException(status_code=404, detail="asset_not_found")
+    return response
 
 @app.get("/api/agents")
-async def get_agents():
-    return {"agents": agents}
-
-@app.get("/api/quantum/mind")
-async def get_quantum_mind():
+async def get_agents(request: Request):
+    return await response_cache.respond(request, "/api/agents", lambda: {"agents": list(agents)})
+
+@app.get("/api/topology")
+async def get_topology(request: Request):
+    return await response_cache.respond(request, "/api/topology", quantum_topology.graph)
+
+@app.get("/api/aggregates")
+async def get_aggregates(request: Request, metric: str = "threats", resolution: str = "1m", agent: str = None):
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"unknown metric: {metric}")
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"unknown resolution: {resolution}")
+    # agent kosong = total armada, "all" = per agent (heatmap), selain itu daftar dipisah koma
+    agent_ids = agent if agent in (None, "all") else tuple(sorted(set(agent.split(","))))
+    return await response_cache.respond(request, "/api/aggregates",
+                                        lambda: quantum_aggregates.series(metric, resolution, agent_ids),
+                                        (metric, resolution, agent_ids))
+
+def load_quantum_mind():
     conn = get_db()
     dreams = conn.execute("SELECT * FROM quantum_dreams ORDER BY timestamp DESC LIMIT 10").fetchall()
     confessions = conn.execute("SELECT * FROM quantum_confessions ORDER BY timestamp DESC LIMIT 10").fetchall()
+    conn.close()
     return {
         "dreams": [dict(d) for d in dreams],
         "confessions": [dict(c) for c in confessions],
         "consciousness_level": consciousness_level
     }
 
-@app.get("/api/temporal/threats")
-async def get_temporal_threats():
+@app.get("/api/quantum/mind")
+async def get_quantum_mind(request: Request):
+    return await response_cache.respond(request, "/api/quantum/mind", load_quantum_mind)
+
+def load_temporal_threats():
     conn = get_db()
     threats = conn.execute("SELECT * FROM temporal_threats ORDER BY probability DESC").fetchall()
+    conn.close()
     return {"threats": [dict(t) for t in threats]}
 
+@app.get("/api/temporal/threats")
+async def get_temporal_threats(request: Request):
+    return await response_cache.respond(request, "/api/temporal/threats", load_temporal_threats)
+
 # ============ QUANTUM AGENT REGISTRATION ============
 @app.post("/agent/quantum/register")
 async def register_quantum_agent(request: Request):
@@ -400,7 +629,8 @@ async def register_quantum_agent(request: Request):
         if not quantum_entanglement.validate_signature(data.get("quantum_signature", "")):
             return {"status": "error", "reason": "invalid_quantum_signature"}
 
-        data['last_seen'] = datetime.now().strftime("%H:%M:%S")
+        data['last_seen'] = datetime.now().isoformat()
+        data['status'] = "active"
         existing = next((a for a in agents if a['agent_id'] == data['agent_id']), None)
         
         # Hitung tingkat kesadaran kuantum
@@ -414,6 +644,9 @@ async def register_quantum_agent(request: Request):
             existing.update(data)
         else:
             agents.append(data)
+        mark_agent_seen(existing or data)
+        update_topology(existing or data)
+        invalidate_agents(added=existing is None)
             
         print(f"🌌 Agent {data['agent_id']} terdaftar (Consciousness: {consciousness:.2f})")
         return {"status": "registered", "consciousness": consciousness}
@@ -438,7 +671,7 @@ async def send_quantum_command(req: Request):
             "status": "rejected",
             "reason": "ethical_violation",
             "ethical_score": ethical_score,
-            "suggestion": neural_synthesis.suggest_ethical_alternative(command)
+            "suggestion": neural_synthesis.suggest_ethical_alternative(command, target)
         }
     
     # Simpan perintah kuantum
@@ -462,19 +695,12 @@ async def send_quantum_command(req: Request):
     mqtt_client.publish(f"throng/commands/{agent_id}", json.dumps(payload))
     
     # Broadcast ke WebSocket
-    for ws in active_websockets:
-        asyncio.run_coroutine_threadsafe(
-            ws.send_text(json.dumps({
-                "type": "quantum_command", 
-                "data": {
-                    "agent_id": agent_id, 
-                    "command": command, 
-                    "target": target,
-                    "ethical_score": ethical_score
-                }
-            })),
-            asyncio.get_event_loop()
-        )
+    quantum_broadcast("quantum_command", {
+        "agent_id": agent_id, 
+        "command": command, 
+        "target": target,
+        "ethical_score": ethical_score
+    })
     
     return {"status": "sent", "ethical_score": ethical_score}
 
@@ -482,9 +708,47 @@ async def send_quantum_command(req: Request):
 @app.websocket("/ws/quantum")
 async def quantum_websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    active_websockets.append(websocket)
+    
+    # Resync: client yang reconnect mengirim boot server dan seq terakhir yang diterimanya
+    last_seq = websocket.query_params.get("last_seq")
+    boot_id = websocket.query_params.get("boot")
+    missed = []
+    resyncing = last_seq is not None and last_seq.isdigit()
+    with broadcast_buffer.lock:
+        if resyncing:
+            missed = broadcast_buffer.since(int(last_seq), boot_id)
+            if missed is None:
+                missed = [json.dumps({
+                    "type": "snapshot",
+                    "seq": broadcast_buffer.seq,
+                    "boot": broadcast_buffer.boot_id,
+                    "data": quantum_snapshot()
+                })]
+            # Tahan frame live sampai replay selesai agar urutan seq di client terjaga
+            broadcast_buffer.held[websocket] = []
+        active_websockets.append(websocket)
     print(f"🌀 WebSocket kuantum terhubung: {len(active_websockets)} client")
     
+    try:
+        while True:
+            for text in missed:
+                await websocket.send_text(text)
+            # Kirim frame yang tertahan selama replay; berhenti menahan setelah antrean kosong
+            with broadcast_buffer.lock:
+                missed = broadcast_buffer.held.pop(websocket, [])
+                if not missed:
+                    break
+                broadcast_buffer.held[websocket] = []
+        if resyncing:
+            # Penanda tanpa seq: client menunda refresh agent sampai replay selesai
+            await websocket.send_text(json.dumps({"type": "resync_complete"}))
+    except:
+        with broadcast_buffer.lock:
+            broadcast_buffer.held.pop(websocket, None)
+            if websocket in active_websockets:
+                active_websockets.remove(websocket)
+        return
+    
     try:
         while True:
             data = await websocket.receive_text()
@@ -506,8 +770,7 @@ async def quantum_websocket_endpoint(websocket: WebSocket):
             print(f"🕳️ WebSocket kuantum putus: {len(active_websockets)} tersisa")
 
 # ============ HEALTH & DEBUG ============
-@app.get("/health/quantum")
-async def quantum_health():
+def load_quantum_health():
     return {
         "status": "quantum_ready",
         "agents": len(agents),
@@ -516,14 +779,83 @@ async def quantum_health():
         "temporal_stability": temporal_analyzer.get_stability()
     }
 
+@app.get("/health/quantum")
+async def quantum_health(request: Request):
+    return await response_cache.respond(request, "/health/quantum", load_quantum_health)
+
 @app.get("/debug/quantum")
 async def quantum_debug():
     return {
         "agents": agents,
         "count": len(agents),
         "websockets": len(active_websockets),
+        "broadcast_buffer": broadcast_buffer.get_status(),
+        "topology": quantum_topology.get_status(),
+        "aggregates": quantum_aggregates.get_status(),
+        "liveness": agent_liveness.get_status(),
+        "policy": neural_synthesis.policy.get_status(),
+        "neural_decoder": neural_synthesis.decoder.get_status(),
+        "response_cache": response_cache.get_status(),
+        "assets": asset_store.get_status(),
+        "mqtt_capture": mqtt_capture.get_status() if mqtt_capture else None,
         "consciousness_level": consciousness_level,
         "quantum_reality": quantum_entanglement.current_reality(),
         "temporal_offset": temporal_analyzer.get_temporal_offset(),
         "time": datetime.now().isoformat()
-    }
\ No newline at end of file
+    }
+
+def require_debug_token(request: Request):
+    """Tolak akses endpoint debug tanpa header X-Debug-Token yang valid"""
+    token = request.headers.get("x-debug-token", "")
+    if not DEBUG_TOKEN or not hmac.compare_digest(token, DEBUG_TOKEN):
+        raise HTTPException(status_code=403, detail="debug_disabled")
+
+@app.get("/debug/profile", response_class=PlainTextResponse)
+async def quantum_profile(request: Request, seconds: float = 5.0, rate: int = 100):
+    require_debug_token(request)
+    # Sampling di thread terpisah agar event loop ikut tersampel, bukan terblokir
+    result = await asyncio.to_thread(quantum_profiler.sample, seconds, rate)
+    if result is None:
+        raise HTTPException(status_code=409, detail="profile_already_running")
+    text, samples = result
+    return PlainTextResponse(text, headers={"X-Profile-Samples": str(samples)})
+
+@app.get("/debug/loop")
+async def quantum_loop_watchdog(request: Request):
+    require_debug_token(request)
+    return loop_watchdog.get_status()
+
+@app.post("/debug/policy/reload")
+async def quantum_policy_reload(request: Request):
+    require_debug_token(request)
+    return neural_synthesis.reload_policy()
+
+@app.get("/debug/memory")
+async def quantum_memory(request: Request):
+    require_debug_token(request)
+    return memory_accountant.report()
+
+@app.post("/debug/memory/trace")
+async def quantum_memory_trace(request: Request, enable: bool = True):
+    require_debug_token(request)
+    if enable:
+        memory_accountant.start_tracing()
+    else:
+        memory_accountant.stop_tracing()
+    return {"tracing": enable}
+
+@app.post("/debug/memory/snapshot")
+async def quantum_memory_snapshot(request: Request):
+    require_debug_token(request)
+    snapshot_id = await asyncio.to_thread(memory_accountant.snapshot)
+    if snapshot_id is None:
+        raise HTTPException(status_code=409, detail="tracemalloc_disabled")
+    return {"snapshot": snapshot_id}
+
+@app.get("/debug/memory/diff")
+async def quantum_memory_diff(request: Request, old: int = None, new: int = None, limit: int = 15):
+    require_debug_token(request)
+    try:
+        return await asyncio.to_thread(memory_accountant.diff, old, new, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,144 @@
+"""
+quantum/aggregates.py — Quantum Aggregates Module
+Counter bergulir berbasis ring buffer NumPy untuk heatmap dan grafik ancaman
+"""
+
+import threading
+import time
+import numpy as np
+
+# Resolusi: nama -> (lebar bucket dalam detik, jumlah bucket)
+RESOLUTIONS = {
+    "1m": (60, 60),      # 1 jam terakhir
+    "1h": (3600, 48),    # 2 hari terakhir
+    "1d": (86400, 30)    # 30 hari terakhir
+}
+
+# Metrik yang direkam dari laporan agent
+METRICS = ("reports", "threats", "threat_probability")
+
+# Metrik rata-rata: dihitung dari jumlah dibagi metrik pembagi
+MEAN_METRICS = {"threat_probability": "reports"}
+
+FLEET = "*"  # Agent semu untuk total seluruh armada
+
+
+class RollingCounter:
+    def __init__(self, width, size):
+        self.width = width
+        self.size = size
+        self.values = np.zeros(size, dtype=np.float64)
+        self.stamps = np.full(size, -1, dtype=np.int64)  # Nomor bucket yang menempati tiap slot
+
+    def add(self, ts, value=1.0):
+        """Tambahkan nilai ke bucket waktu ts dalam O(1)"""
+        bucket = int(ts // self.width)
+        slot = bucket % self.size
+        if self.stamps[slot] != bucket:
+            self.stamps[slot] = bucket
+            self.values[slot] = 0.0
+        self.values[slot] += value
+
+    def add_many(self, timestamps, values, now=None):
+        """Tambahkan banyak nilai sekaligus secara tervektorisasi (dipakai saat rebuild)"""
+        now_bucket = int((now or time.time()) // self.width)
+        buckets = (np.asarray(timestamps, dtype=np.float64) // self.width).astype(np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        keep = (buckets > now_bucket - self.size) & (buckets <= now_bucket)
+        buckets, values = buckets[keep], values[keep]
+        slots = buckets % self.size
+        stale = self.stamps[slots] != buckets
+        self.values[slots[stale]] = 0.0
+        self.stamps[slots] = buckets
+        np.add.at(self.values, slots, values)
+
+    def series(self, now=None):
+        """Deret nilai dari bucket terlama ke terbaru, mengembalikan (awal bucket pertama, array)"""
+        now_bucket = int((now or time.time()) // self.width)
+        expected = np.arange(now_bucket - self.size + 1, now_bucket + 1, dtype=np.int64)
+        slots = expected % self.size
+        values = np.where(self.stamps[slots] == expected, self.values[slots], 0.0)
+        return int(expected[0] * self.width), values
+
+
+class QuantumAggregates:
+    def __init__(self, resolutions=RESOLUTIONS):
+        self.resolutions = resolutions
+        self.counters = {}  # (agent_id, metric) -> {resolusi: RollingCounter}
+        self.lock = threading.Lock()
+
+    def _counters(self, agent_id, metric):
+        key = (agent_id, metric)
+        counters = self.counters.get(key)
+        if counters is None:
+            counters = {name: RollingCounter(width, size) for name, (width, size) in self.resolutions.items()}
+            self.counters[key] = counters
+        return counters
+
+    def record(self, agent_id, metric, value=1.0, ts=None):
+        """Catat satu nilai untuk agent dan total armada di semua resolusi"""
+        ts = ts or time.time()
+        with self.lock:
+            for owner in (agent_id, FLEET):
+                for counter in self._counters(owner, metric).values():
+                    counter.add(ts, value)
+
+    def rebuild(self, agent_id, metric, timestamps, values):
+        """Isi ulang counter dari data historis (mis. SQLite saat startup)"""
+        with self.lock:
+            for owner in (agent_id, FLEET):
+                for counter in self._counters(owner, metric).values():
+                    counter.add_many(timestamps, values)
+
+    def series(self, metric, resolution="1m", agent_ids=None):
+        """
+        Deret siap-grafik untuk satu metrik dan resolusi.
+        agent_ids None berarti total armada saja; "all" berarti semua agent (untuk heatmap).
+        """
+        if resolution not in self.resolutions:
+            raise ValueError(f"unknown resolution: {resolution}")
+        width, size = self.resolutions[resolution]
+        now = time.time()
+
+        with self.lock:
+            if agent_ids is None:
+                agent_ids = [FLEET]
+            elif agent_ids == "all":
+                agent_ids = sorted({a for a, _ in self.counters if a != FLEET})
+
+            start = int((now // width - size + 1) * width)
+            result = {}
+            for agent_id in agent_ids:
+                start, values = self._read(agent_id, metric, resolution, now)
+                result[agent_id] = values.round(4).tolist()
+
+        return {
+            "metric": metric,
+            "resolution": resolution,
+            "width": width,
+            "buckets": [start + i * width for i in range(size)],
+            "series": result
+        }
+
+    def _read(self, agent_id, metric, resolution, now):
+        width, size = self.resolutions[resolution]
+        divisor_metric = MEAN_METRICS.get(metric)
+        counters = self.counters.get((agent_id, metric))
+        if counters is None:
+            return int((now // width - size + 1) * width), np.zeros(size)
+        start, values = counters[resolution].series(now)
+        if divisor_metric:
+            divisor = self.counters.get((agent_id, divisor_metric))
+            if divisor is None:
+                return start, np.zeros(size)
+            _, counts = divisor[resolution].series(now)
+            values = np.divide(values, counts, out=np.zeros(size), where=counts > 0)
+        return start, values
+
+    def get_status(self):
+        """Dapatkan status counter agregat"""
+        return {
+            "series": len(self.counters),
+            "resolutions": list(self.resolutions),
+            "bytes": sum(c.values.nbytes + c.stamps.nbytes for cs in self.counters.values() for c in cs.values())
+        }
@@ -0,0 +1,101 @@
+"""
+quantum/assets.py — Quantum Asset Store
+Aset statis dan template yang dirender/dikompresi sekali saat startup lalu dilayani dari memori
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # Brotli opsional; tanpa itu hanya gzip yang disiapkan
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class Asset:
+    def __init__(self, data, media_type):
+        self.media_type = media_type
+        self.digest = hashlib.sha256(data).hexdigest()
+        self.variants = {"identity": data}
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(compressed) < len(data):
+            self.variants["gzip"] = compressed
+        if brotli is not None:
+            compressed = brotli.compress(data, quality=11)
+            if len(compressed) < len(data):
+                self.variants["br"] = compressed
+
+    def etag(self, encoding):
+        """ETag kuat per varian; body gzip/br berbeda byte dari identity sehingga butuh tag sendiri"""
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{self.digest[:16]}{suffix}"'
+
+    def sizes(self):
+        return {encoding: len(body) for encoding, body in self.variants.items()}
+
+
+class AssetStore:
+    def __init__(self):
+        self.assets = {}  # path yang dilayani -> (Asset, Cache-Control)
+        self.urls = {}  # nama asli -> URL ber-hash
+
+    def add_static(self, directory, prefix="/assets", legacy_prefix="/static"):
+        """
+        Muat semua file di directory sebagai aset immutable dengan URL ber-hash isi.
+        Path lama legacy_prefix/nama tetap dilayani dari data yang sama, tapi divalidasi ulang via ETag.
+        """
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, directory).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    data = f.read()
+                media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                asset = Asset(data, media_type)
+                stem, ext = os.path.splitext(name)
+                url = f"{prefix}/{stem}.{asset.digest[:12]}{ext}"
+                self.assets[url] = (asset, IMMUTABLE)
+                self.assets[f"{legacy_prefix}/{name}"] = (asset, REVALIDATE)
+                self.urls[name] = url
+
+    def add_page(self, path, html):
+        """Simpan halaman yang sudah dirender; divalidasi ulang via ETag karena URL-nya tetap"""
+        self.assets[path] = (Asset(html.encode(), "text/html; charset=utf-8"), REVALIDATE)
+
+    def url(self, name):
+        """URL ber-hash untuk aset statis, dipakai di template sebagai asset_url()"""
+        return self.urls.get(name, f"/static/{name}")
+
+    def respond(self, request, path):
+        """Layani aset dengan encoding terbaik yang diterima client, atau 304 jika ETag cocok"""
+        stored = self.assets.get(path)
+        if stored is None:
+            return None
+        asset, cache_control = stored
+        accepted = request.headers.get("accept-encoding", "")
+        encoding = next((e for e in ("br", "gzip") if e in asset.variants and e in accepted), "identity")
+
+        etag = asset.etag(encoding)
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        if_none_match = request.headers.get("if-none-match", "")
+        if if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        return Response(asset.variants[encoding], media_type=asset.media_type, headers=headers)
+
+    def total_bytes(self):
+        """Total byte semua varian; aset yang dilayani di beberapa path dihitung sekali"""
+        unique = {id(asset): asset for asset, _ in self.assets.values()}
+        return sum(sum(asset.sizes().values()) for asset in unique.values())
+
+    def get_status(self):
+        """Dapatkan daftar aset dan ukuran tiap varian encoding"""
+        return {path: asset.sizes() for path, (asset, _) in self.assets.items()}
@@ -0,0 +1,57 @@
+"""
+quantum/broadcast.py — Quantum Broadcast Buffer
+Ring buffer frame broadcast berurutan untuk resync client WebSocket yang reconnect
+"""
+
+import json
+import threading
+import uuid
+from collections import deque
+
+
+class QuantumBroadcastBuffer:
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.frames = deque(maxlen=capacity)  # (seq, teks frame)
+        self.seq = 0
+        self.boot_id = uuid.uuid4().hex[:12]  # Berubah tiap restart; seq dari boot lain tidak valid
+        self.held = {}  # client -> frame live yang ditahan selama replay resync
+        self.lock = threading.Lock()
+
+    def append(self, frame):
+        """
+        Beri nomor urut pada frame, serialisasi sekali, dan simpan di ring buffer.
+        Harus dipanggil saat memegang self.lock agar urutan seq sama dengan urutan kirim.
+        """
+        self.seq += 1
+        frame["seq"] = self.seq
+        frame["boot"] = self.boot_id
+        text = json.dumps(frame)
+        self.frames.append((self.seq, text))
+        return text
+
+    def since(self, last_seq, boot_id=None):
+        """
+        Ambil frame dengan seq > last_seq.
+        Mengembalikan None jika client perlu snapshot: tertinggal lebih jauh dari isi buffer,
+        berasal dari boot server lain, atau seq-nya di depan server.
+        Harus dipanggil saat memegang self.lock.
+        """
+        if boot_id != self.boot_id or last_seq > self.seq:
+            return None
+        if last_seq == self.seq:
+            return []
+        if last_seq < 0 or not self.frames or self.frames[0][0] > last_seq + 1:
+            return None
+        return [text for seq, text in self.frames if seq > last_seq]
+
+    def get_status(self):
+        """Dapatkan status buffer broadcast"""
+        return {
+            "seq": self.seq,
+            "boot": self.boot_id,
+            "held_clients": len(self.held),
+            "buffered": len(self.frames),
+            "capacity": self.capacity,
+            "oldest_seq": self.frames[0][0] if self.frames else None
+        }
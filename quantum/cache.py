@@ -0,0 +1,136 @@
+"""
+quantum/cache.py — Quantum Response Cache
+Micro-cache respons GET dengan TTL per route, body yang sudah diserialisasi/dikompresi,
+single-flight untuk request identik, dan invalidasi eksplisit saat data berubah
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.responses import Response
+
+
+class ComputeAbandoned(Exception):
+    """Perhitungan pemimpin single-flight dibatalkan sebelum selesai"""
+
+
+class CachedBody:
+    def __init__(self, body, expires, generation, min_gzip):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=5) if len(body) >= min_gzip else None
+        self.expires = expires
+        self.generation = generation
+
+
+class ResponseCache:
+    def __init__(self, ttls, min_gzip=1024, max_entries=256):
+        self.ttls = ttls  # route -> TTL dalam detik
+        self.min_gzip = min_gzip
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (route, params) -> CachedBody, urutan LRU
+        self.inflight = {}  # (route, params) -> Future; hanya disentuh dari event loop
+        self.generations = {route: 0 for route in ttls}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.lock = threading.Lock()
+
+    def invalidate(self, *routes):
+        """Tandai cache route usang; aman dipanggil dari thread MQTT"""
+        with self.lock:
+            for route in routes:
+                self.generations[route] = self.generations.get(route, 0) + 1
+                for key in [k for k in self.entries if k[0] == route]:
+                    del self.entries[key]
+
+    def _fresh(self, key, route):
+        entry = self.entries.get(key)
+        if entry and entry.expires > time.monotonic() and entry.generation == self.generations.get(route):
+            return entry
+        return None
+
+    async def respond(self, request, route, compute, params=()):
+        """
+        Layani route dari cache atau hitung sekali via compute (fungsi sinkron, dijalankan di thread).
+        params adalah tuple parameter yang sudah divalidasi; bersama route menjadi kunci cache.
+        Request identik yang datang saat perhitungan berjalan menunggu hasil yang sama.
+        """
+        key = (route, params)
+        with self.lock:
+            entry = self._fresh(key, route)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is not None:
+            self.hits += 1
+        else:
+            pending = self.inflight.get(key)
+            entry = None
+            if pending is not None:
+                self.coalesced += 1
+                try:
+                    entry = await asyncio.shield(pending)
+                except ComputeAbandoned:
+                    pass  # Pemimpin dibatalkan; hitung sendiri di bawah
+            if entry is None:
+                self.misses += 1
+                entry = await self._compute(key, route, compute)
+
+        headers = {"Vary": "Accept-Encoding"}
+        if entry.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(entry.gzipped, media_type="application/json", headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    async def _compute(self, key, route, compute):
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            with self.lock:
+                generation = self.generations.get(route, 0)
+            data = await asyncio.to_thread(compute)
+            body = json.dumps(data, separators=(",", ":"), default=str).encode()
+            entry = CachedBody(body, time.monotonic() + self.ttls.get(route, 1.0), generation, self.min_gzip)
+            with self.lock:
+                # Jangan simpan hasil yang sudah usang karena ada tulis selama perhitungan
+                if self.generations.get(route, 0) == generation:
+                    self._store(key, entry)
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Tandai sudah diambil agar tidak ada warning jika tak ada yang menunggu
+            raise
+        finally:
+            # CancelledError tidak tertangkap di atas; pastikan penunggu tidak menggantung selamanya
+            if not future.done():
+                future.set_exception(ComputeAbandoned())
+                future.exception()
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+
+    def _store(self, key, entry):
+        """Simpan entry; buang yang kedaluwarsa lalu yang paling lama tak dipakai jika penuh"""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            now = time.monotonic()
+            for k in [k for k, e in self.entries.items() if e.expires <= now]:
+                del self.entries[k]
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_status(self):
+        """Dapatkan status response cache"""
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self.inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "ttls": self.ttls
+        }
@@ -0,0 +1,179 @@
+"""
+quantum/capture.py — Quantum Capture Module
+Rekam lalu lintas MQTT masuk ke file length-prefixed yang bisa di-mmap, lalu putar ulang
+ke pipeline ingestion untuk benchmark dan profiling yang deterministik
+
+Format: header MAGIC, lalu record berulang
+    <d  timestamp terima (epoch detik)
+    <H  panjang topic
+    <I  panjang payload
+    topic (utf-8), payload (bytes mentah)
+
+Pemakaian:
+    python -m quantum.capture info capture.orbcap
+    python -m quantum.capture replay capture.orbcap --speed max
+"""
+
+import argparse
+import atexit
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import Counter
+
+MAGIC = b"ORBCAP1\n"
+RECORD_HEADER = struct.Struct("<dHI")
+
+
+class CapturedMessage:
+    """Pengganti ringan paho MQTTMessage untuk replay"""
+
+    def __init__(self, topic, payload, timestamp):
+        self.topic = topic
+        self.payload = payload
+        self.timestamp = timestamp
+
+
+class CaptureWriter:
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.file = open(path, "ab", buffering=1 << 16)
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.count = 0
+        self.lock = threading.Lock()
+        # Flush berkala dari thread sendiri agar ekor capture tetap tertulis walau broker sepi
+        threading.Thread(target=self._flush_loop, name="capture-flush", daemon=True).start()
+        atexit.register(self.close)
+
+    def _flush_loop(self):
+        while not self.file.closed:
+            time.sleep(self.flush_interval)
+            with self.lock:
+                if not self.file.closed:
+                    self.file.flush()
+
+    def write(self, topic, payload, timestamp=None):
+        """Tambahkan satu pesan ke file capture"""
+        topic = topic.encode()
+        with self.lock:
+            self.file.write(RECORD_HEADER.pack(timestamp or time.time(), len(topic), len(payload)))
+            self.file.write(topic)
+            self.file.write(payload)
+            self.count += 1
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def get_status(self):
+        """Dapatkan status perekaman"""
+        return {"path": self.path, "messages": self.count}
+
+
+def read_capture(path):
+    """Iterasi pesan dari file capture lewat mmap tanpa memuat seluruh file ke memori"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} bukan file capture ORB")
+            offset = len(MAGIC)
+            end = len(mm)
+            while offset + RECORD_HEADER.size <= end:
+                timestamp, topic_len, payload_len = RECORD_HEADER.unpack_from(mm, offset)
+                offset += RECORD_HEADER.size
+                if offset + topic_len + payload_len > end:
+                    break  # Record terakhir terpotong (mis. proses mati saat menulis)
+                topic = mm[offset:offset + topic_len].decode()
+                offset += topic_len
+                payload = mm[offset:offset + payload_len]
+                offset += payload_len
+                yield CapturedMessage(topic, payload, timestamp)
+
+
+def replay(path, handler, speed=1.0):
+    """
+    Putar ulang capture ke handler(client, userdata, msg) seperti callback paho on_message.
+    speed 1.0 = waktu asli, N = N kali lebih cepat, None = secepat mungkin.
+    """
+    topics = Counter()
+    first_ts = None
+    start = time.perf_counter()
+    for msg in read_capture(path):
+        if speed:
+            if first_ts is None:
+                first_ts = msg.timestamp
+            delay = (msg.timestamp - first_ts) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        handler(None, None, msg)
+        topics[msg.topic] += 1
+    elapsed = time.perf_counter() - start
+    count = sum(topics.values())
+    return {
+        "messages": count,
+        "elapsed_s": round(elapsed, 3),
+        "messages_per_s": round(count / elapsed, 1) if elapsed else None,
+        "topics": dict(topics)
+    }
+
+
+def info(path):
+    """Ringkasan isi file capture"""
+    topics = Counter()
+    first = last = None
+    payload_bytes = 0
+    for msg in read_capture(path):
+        topics[msg.topic] += 1
+        payload_bytes += len(msg.payload)
+        first = msg.timestamp if first is None else first
+        last = msg.timestamp
+    return {
+        "messages": sum(topics.values()),
+        "payload_bytes": payload_bytes,
+        "duration_s": round(last - first, 3) if first is not None else 0,
+        "topics": dict(topics)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rekam/putar ulang lalu lintas MQTT THE ORB")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_info = sub.add_parser("info", help="ringkasan file capture")
+    p_info.add_argument("path")
+    p_replay = sub.add_parser("replay", help="putar ulang capture ke pipeline ingestion")
+    p_replay.add_argument("path")
+    p_replay.add_argument("--speed", default="1", help="1 = waktu asli, N = N kali lebih cepat, max = tanpa jeda")
+    p_replay.add_argument("--handler", default="main:on_message", help="modul:fungsi callback on_message")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        print(info(args.path))
+        return
+
+    # Pipeline berjalan apa adanya, tapi tanpa broker, tanpa merekam ulang lalu lintas yang diputar,
+    # dan di atas DB kosong baru agar setiap replay dimulai dari state yang sama
+    workdir = tempfile.mkdtemp(prefix="orb-replay-")
+    os.environ["ORB_MQTT_OFFLINE"] = "1"
+    os.environ["ORB_DB_PATH"] = os.path.join(workdir, "orb_replay.db")
+    os.environ.pop("MQTT_CAPTURE_PATH", None)
+    try:
+        import importlib
+        module_name, func_name = args.handler.split(":")
+        handler = getattr(importlib.import_module(module_name), func_name)
+        speed = None if args.speed == "max" else float(args.speed)
+        print(replay(args.path, handler, speed))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
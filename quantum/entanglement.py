@@ -56,12 +56,12 @@ class QuantumEntanglement:
         
         # Faktor berdasarkan konteks
         context_factor = 0
-        if context_
+        if context_data:
             # Jika ada data ancaman
             if context_data.get("threat_probability", 0) > 0.5:
                 context_factor += 0.15
             # Jika ada refleksi diri
-            if "dream" in context_
+            if "dream" in context_data:
                 context_factor += 0.1
             
         # Hitung total dengan noise acak untuk simulasi ketidakpastian kuantum
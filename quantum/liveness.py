@@ -0,0 +1,108 @@
+"""
+quantum/liveness.py — Quantum Liveness Module
+Pelacakan keaktifan agent dengan hashed timer wheel berbasis waktu monotonic
+"""
+
+import math
+import threading
+import time
+
+ACTIVE = "active"
+STALE = "stale"
+LOST = "lost"
+
+
+class HashedTimerWheel:
+    def __init__(self, tick=1.0, slots=512):
+        self.tick = tick
+        self.slots = [dict() for _ in range(slots)]  # key -> tick deadline
+        self.timers = {}  # key -> indeks slot
+        self.current_tick = int(time.monotonic() // tick)
+
+    def schedule(self, key, deadline):
+        """Jadwalkan (atau jadwalkan ulang) timer untuk key pada waktu monotonic deadline, O(1)"""
+        self.cancel(key)
+        deadline_tick = max(self.current_tick + 1, math.ceil(deadline / self.tick))
+        index = deadline_tick % len(self.slots)
+        self.slots[index][key] = deadline_tick
+        self.timers[key] = index
+
+    def cancel(self, key):
+        """Batalkan timer untuk key jika ada, O(1)"""
+        index = self.timers.pop(key, None)
+        if index is not None:
+            self.slots[index].pop(key, None)
+
+    def advance(self, now=None):
+        """Majukan wheel sampai waktu now, mengembalikan key yang timernya habis"""
+        now_tick = int((now if now is not None else time.monotonic()) // self.tick)
+        expired = []
+        # Cukup satu putaran penuh: slot yang sama tidak perlu diperiksa dua kali
+        start = max(self.current_tick + 1, now_tick - len(self.slots) + 1)
+        for t in range(start, now_tick + 1):
+            slot = self.slots[t % len(self.slots)]
+            due = [key for key, deadline_tick in slot.items() if deadline_tick <= now_tick]
+            for key in due:
+                del slot[key]
+                del self.timers[key]
+            expired.extend(due)
+        self.current_tick = max(self.current_tick, now_tick)
+        return expired
+
+    def __len__(self):
+        return len(self.timers)
+
+
+class QuantumLiveness:
+    def __init__(self, stale_timeout=180, lost_timeout=3600, tick=1.0, slots=512):
+        self.stale_timeout = stale_timeout
+        self.lost_timeout = lost_timeout
+        self.wheel = HashedTimerWheel(tick, slots)
+        self.states = {}  # agent_id -> (status, last_seen monotonic)
+        self.lock = threading.Lock()
+
+    def touch(self, agent_id, now=None):
+        """
+        Catat bahwa agent baru saja terlihat.
+        Mengembalikan status sebelumnya jika agent kembali aktif dari stale/lost, selain itu None.
+        """
+        now = now if now is not None else time.monotonic()
+        with self.lock:
+            previous = self.states.get(agent_id, (None, None))[0]
+            self.states[agent_id] = (ACTIVE, now)
+            self.wheel.schedule(agent_id, now + self.stale_timeout)
+        return previous if previous in (STALE, LOST) else None
+
+    def forget(self, agent_id):
+        """Berhenti melacak agent"""
+        with self.lock:
+            self.states.pop(agent_id, None)
+            self.wheel.cancel(agent_id)
+
+    def expire(self, now=None):
+        """Proses timer yang habis, mengembalikan daftar transisi (agent_id, status baru, detik sejak terlihat)"""
+        now = now if now is not None else time.monotonic()
+        transitions = []
+        with self.lock:
+            for agent_id in self.wheel.advance(now):
+                status, last_seen = self.states[agent_id]
+                if status == ACTIVE:
+                    self.states[agent_id] = (STALE, last_seen)
+                    self.wheel.schedule(agent_id, last_seen + self.lost_timeout)
+                    transitions.append((agent_id, STALE, now - last_seen))
+                elif status == STALE:
+                    self.states[agent_id] = (LOST, last_seen)
+                    transitions.append((agent_id, LOST, now - last_seen))
+        return transitions
+
+    def get_status(self):
+        """Dapatkan ringkasan status keaktifan agent"""
+        counts = {ACTIVE: 0, STALE: 0, LOST: 0}
+        for status, _ in list(self.states.values()):
+            counts[status] += 1
+        return {
+            **counts,
+            "timers": len(self.wheel),
+            "stale_timeout": self.stale_timeout,
+            "lost_timeout": self.lost_timeout
+        }
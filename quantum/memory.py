@@ -0,0 +1,136 @@
+"""
+quantum/memory.py — Quantum Memory Accounting
+Akuntansi memori per subsistem: ukuran buffer/antrian internal, snapshot tracemalloc,
+dan diff antar snapshot yang dikelompokkan per subsistem untuk melacak kebocoran
+"""
+
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+
+import psutil
+
+from quantum.profiler import PROJECT_ROOT, is_project_file
+
+# Potongan path pustaka -> nama subsistem, untuk alokasi di luar kode proyek
+LIBRARY_SUBSYSTEMS = [
+    ("paho", "mqtt"),
+    ("starlette", "web"),
+    ("fastapi", "web"),
+    ("uvicorn", "web"),
+    ("websockets", "web"),
+    ("sqlite3", "sqlite"),
+    ("numpy", "numpy"),
+    ("json", "json"),
+    ("asyncio", "asyncio"),
+]
+
+
+def subsystem_of(filename):
+    """Petakan file sumber alokasi ke nama subsistem"""
+    if is_project_file(filename):
+        rel = os.path.relpath(filename, PROJECT_ROOT).replace(os.sep, "/")
+        if rel.startswith("quantum/"):
+            return rel[len("quantum/"):-3]
+        return rel[:-3] if rel.endswith(".py") else rel
+    for fragment, name in LIBRARY_SUBSYSTEMS:
+        if f"/{fragment}/" in filename or filename.endswith(f"/{fragment}.py"):
+            return name
+    return "other"
+
+
+def _code_path(traceback):
+    """Frame terdalam yang berada di kode proyek; alokasi pustaka diatribusikan ke pemanggilnya"""
+    for frame in reversed(traceback):
+        if is_project_file(frame.filename):
+            return frame
+    return traceback[-1]
+
+
+class MemoryAccountant:
+    def __init__(self, frames=10, max_snapshots=4):
+        self.frames = frames
+        self.max_snapshots = max_snapshots
+        self.sizers = OrderedDict()  # nama subsistem -> fungsi yang mengembalikan ukuran/jumlah
+        self.snapshots = OrderedDict()  # id -> (waktu, snapshot)
+        self.next_id = 1
+
+    def register(self, name, sizer):
+        """Daftarkan fungsi pengukur untuk satu subsistem"""
+        self.sizers[name] = sizer
+
+    def start_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop_tracing(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.snapshots.clear()
+
+    def report(self):
+        """Ukuran semua subsistem terdaftar, RSS proses, dan status tracemalloc"""
+        subsystems = {}
+        for name, sizer in self.sizers.items():
+            try:
+                subsystems[name] = sizer()
+            except Exception as e:  # Satu pengukur gagal tidak boleh menjatuhkan laporan
+                subsystems[name] = {"error": str(e)}
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (None, None)
+        return {
+            "rss_bytes": psutil.Process().memory_info().rss,
+            "tracemalloc": {"tracing": tracing, "current_bytes": current, "peak_bytes": peak,
+                            "snapshots": list(self.snapshots)},
+            "subsystems": subsystems
+        }
+
+    def snapshot(self):
+        """Ambil snapshot tracemalloc; mengembalikan id, atau None jika tracing tidak aktif"""
+        if not tracemalloc.is_tracing():
+            return None
+        snap = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        snapshot_id = self.next_id
+        self.next_id += 1
+        self.snapshots[snapshot_id] = (time.time(), snap)
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+        return snapshot_id
+
+    def diff(self, old_id=None, new_id=None, limit=15):
+        """
+        Bandingkan dua snapshot (default: dua terakhir).
+        Pertumbuhan dikelompokkan per subsistem dan per baris kode proyek yang memicunya.
+        """
+        ids = list(self.snapshots)
+        old_id = old_id or (ids[-2] if len(ids) >= 2 else None)
+        new_id = new_id or (ids[-1] if ids else None)
+        if old_id not in self.snapshots or new_id not in self.snapshots:
+            raise KeyError("snapshot tidak ditemukan")
+        old_time, old_snap = self.snapshots[old_id]
+        new_time, new_snap = self.snapshots[new_id]
+
+        subsystems = {}
+        code_paths = {}
+        for stat in new_snap.compare_to(old_snap, "traceback"):
+            if not stat.size_diff and not stat.count_diff:
+                continue
+            frame = _code_path(stat.traceback)
+            for bucket, key in ((subsystems, subsystem_of(frame.filename)),
+                                (code_paths, f"{os.path.relpath(frame.filename, PROJECT_ROOT)}:{frame.lineno}")):
+                entry = bucket.setdefault(key, {"size_diff": 0, "count_diff": 0})
+                entry["size_diff"] += stat.size_diff
+                entry["count_diff"] += stat.count_diff
+
+        top_paths = sorted(code_paths.items(), key=lambda item: item[1]["size_diff"], reverse=True)[:limit]
+        return {
+            "old": old_id,
+            "new": new_id,
+            "interval_s": round(new_time - old_time, 1),
+            "subsystems": dict(sorted(subsystems.items(), key=lambda item: item[1]["size_diff"], reverse=True)),
+            "top_code_paths": dict(top_paths)
+        }
@@ -0,0 +1,159 @@
+"""
+quantum/neural.py — Neural Synthesis Module
+Evaluasi etika perintah, dekode pola gelombang otak, dan penilaian warisan digital
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config import policy as policy_config
+from quantum.policy import PolicyEngine
+
+
+class BrainWavePattern:
+    STABLE = "STABLE"
+    ACTIVE = "ACTIVE"
+    THREAT_DETECTED = "THREAT_DETECTED"
+    COMMAND_RECEIVED = "COMMAND_RECEIVED"
+
+    ALL = (STABLE, ACTIVE, THREAT_DETECTED, COMMAND_RECEIVED)
+
+    # Ambang klasifikasi gelombang numerik
+    THREAT_VARIANCE = 0.5
+    COMMAND_VARIANCE = 0.2
+    ACTIVE_AMPLITUDE = 0.3
+
+
+class PatternDecoder:
+    def __init__(self, cache_size=1024):
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # hash isi pola -> hasil dekode
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(pattern):
+        """Hash isi pola; pola identik (mis. echo dari MQTT) menghasilkan kunci yang sama"""
+        if isinstance(pattern, str):
+            # String dari operator bisa sepanjang apa pun; yang disimpan hanya digest berukuran tetap
+            return "s:" + hashlib.blake2b(pattern.encode(), digest_size=16).hexdigest()
+        arr = np.ascontiguousarray(pattern, dtype=np.float64)
+        digest = hashlib.blake2b(arr.tobytes(), digest_size=16)
+        digest.update(str(arr.shape).encode())
+        return "w:" + digest.hexdigest()
+
+    @staticmethod
+    def _classify(amplitude, variance):
+        """Klasifikasi tervektorisasi dari amplitudo dan varians gelombang"""
+        return np.select(
+            [variance > BrainWavePattern.THREAT_VARIANCE,
+             variance > BrainWavePattern.COMMAND_VARIANCE,
+             amplitude > BrainWavePattern.ACTIVE_AMPLITUDE],
+            [BrainWavePattern.THREAT_DETECTED, BrainWavePattern.COMMAND_RECEIVED, BrainWavePattern.ACTIVE],
+            BrainWavePattern.STABLE
+        )
+
+    @staticmethod
+    def _decode_uncached(pattern):
+        if isinstance(pattern, str):
+            name = pattern.upper()
+            return {"decoded": name if name in BrainWavePattern.ALL else BrainWavePattern.STABLE}
+        arr = np.asarray(pattern, dtype=np.float64).ravel()
+        amplitude = float(np.abs(arr).mean()) if arr.size else 0.0
+        variance = float(arr.var()) if arr.size else 0.0
+        return {
+            "pattern": "WAVEFORM",
+            "decoded": str(PatternDecoder._classify(amplitude, variance)),
+            "amplitude": round(amplitude, 4),
+            "variance": round(variance, 4)
+        }
+
+    def _store(self, key, result):
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def decode(self, pattern):
+        """Dekode satu pola (nama status atau deret sampel), memakai cache LRU berbasis hash isi"""
+        key = self.content_hash(pattern)
+        with self.lock:
+            result = self.cache.get(key)
+            if result is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if result is None:
+            result = self._decode_uncached(pattern)
+            with self.lock:
+                self._store(key, result)
+        if isinstance(pattern, str):
+            return {"pattern": pattern, **result}  # Input mentah tidak ikut disimpan di cache
+        return dict(result)
+
+    def decode_batch(self, patterns):
+        """Dekode array NumPy (n_pola, n_sampel) dalam satu lintasan tervektorisasi"""
+        arr = np.asarray(patterns, dtype=np.float64)
+        if arr.ndim == 1:
+            arr = arr[np.newaxis, :]
+        amplitude = np.abs(arr).mean(axis=1)
+        variance = arr.var(axis=1)
+        labels = self._classify(amplitude, variance)
+        results = [
+            {"pattern": "WAVEFORM", "decoded": str(label), "amplitude": round(float(a), 4), "variance": round(float(v), 4)}
+            for label, a, v in zip(labels, amplitude, variance)
+        ]
+        with self.lock:
+            for row, result in zip(arr, results):
+                self._store(self.content_hash(row), result)
+        return results
+
+    def get_status(self):
+        """Dapatkan status cache dekoder"""
+        return {"cache_size": len(self.cache), "hits": self.hits, "misses": self.misses}
+
+
+class NeuralSynthesis:
+    def __init__(self, rules=None, default_score=None, cache_size=4096, pattern_cache_size=1024):
+        self.decoder = PatternDecoder(pattern_cache_size)
+        self.policy = PolicyEngine(
+            policy_config.POLICY_RULES if rules is None else rules,
+            policy_config.DEFAULT_SCORE if default_score is None else default_score,
+            cache_size
+        )
+
+    def reload_policy(self):
+        """Muat ulang rule dari config.policy; cache keputusan ikut dikosongkan"""
+        import importlib
+        config = importlib.reload(policy_config)
+        self.policy.load(config.POLICY_RULES, config.DEFAULT_SCORE)
+        return self.policy.get_status()
+
+    def evaluate_command(self, command, target=""):
+        """Skor etika perintah (0.0 tidak etis - 1.0 sepenuhnya etis)"""
+        return self.policy.decide(command, target)["score"]
+
+    def suggest_ethical_alternative(self, command, target=""):
+        """Saran perintah alternatif untuk perintah yang ditolak"""
+        suggestion = self.policy.decide(command, target)["suggestion"]
+        return suggestion or "scan_target"
+
+    def decode_pattern(self, pattern):
+        """Dekode pola gelombang otak menjadi status neural"""
+        return self.decoder.decode(pattern)
+
+    def decode_patterns(self, patterns):
+        """Dekode banyak pola gelombang sekaligus (array NumPy 2D)"""
+        return self.decoder.decode_batch(patterns)
+
+    def evaluate_ethics(self, knowledge):
+        """Nilai dampak etis warisan digital dari pengetahuan yang diwariskan agent"""
+        if not knowledge:
+            return 0.5
+        text = str(knowledge).lower()
+        harmful = sum(text.count(word) for word in ("exploit", "credential", "password", "replicate"))
+        return max(0.0, min(1.0, 0.8 - 0.1 * harmful))
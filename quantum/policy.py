@@ -0,0 +1,210 @@
+"""
+quantum/policy.py — Quantum Policy Engine
+Mesin kebijakan etika perintah: rule deklaratif dikompilasi menjadi matcher cepat
+(lookup persis, prefix trie, regex set, rentang CIDR) dengan cache keputusan LRU
+"""
+
+import ipaddress
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+class CompiledRule:
+    def __init__(self, index, rule):
+        self.index = index
+        self.name = rule.get("name", f"rule_{index}")
+        self.score = float(rule["score"])
+        self.suggestion = rule.get("suggestion")
+        self.targets = self._compile_networks(rule.get("targets"))
+        self.exclude_targets = self._compile_networks(rule.get("exclude_targets"))
+
+    @staticmethod
+    def _compile_networks(cidrs):
+        if cidrs is None:
+            return None
+        ranges = []
+        for cidr in cidrs:
+            net = ipaddress.ip_network(cidr, strict=False)
+            ranges.append((net.version, int(net.network_address), int(net.broadcast_address)))
+        return ranges
+
+    @staticmethod
+    def _within(target, ranges):
+        if target is None:
+            return False
+        version, start, end = target
+        return any(v == version and lo <= start and end <= hi for v, lo, hi in ranges)
+
+    def matches_target(self, target):
+        if self.targets is not None and not self._within(target, self.targets):
+            return False
+        if self.exclude_targets is not None and self._within(target, self.exclude_targets):
+            return False
+        return True
+
+
+REGEX_META = set(".^$*+?{}[]\\|()")
+
+
+def literal_prefix(pattern):
+    """Prefix literal dari regex ber-anchor ^, dipakai untuk mengindeks regex di trie"""
+    if not pattern.startswith("^") or "|" in pattern:
+        return ""
+    prefix = []
+    for ch in pattern[1:]:
+        if ch in REGEX_META:
+            # Karakter sebelum quantifier bisa muncul nol kali, jadi bukan bagian prefix pasti
+            if ch in "*?{" and prefix:
+                prefix.pop()
+            break
+        prefix.append(ch)
+    return "".join(prefix)
+
+
+class PolicyEngine:
+    def __init__(self, rules=(), default_score=0.9, cache_size=4096):
+        self.default_score = default_score
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (command, target) -> keputusan
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.load(rules, default_score)
+
+    def load(self, rules, default_score=None):
+        """Kompilasi ulang rule dan kosongkan cache keputusan"""
+        exact = {}
+        trie = {}
+        regexes = []
+        compiled = []
+        for index, rule in enumerate(rules):
+            cr = CompiledRule(index, rule)
+            compiled.append(cr)
+            for pattern in rule.get("commands", ["*"]):
+                if pattern.startswith("re:"):
+                    # Regex diindeks di trie berdasarkan prefix literalnya, sisanya selalu diuji
+                    node = trie
+                    for ch in literal_prefix(pattern[3:]):
+                        node = node.setdefault(ch, {})
+                    node.setdefault("re", []).append((re.compile(pattern[3:]), cr))
+                    regexes.append(cr)
+                elif pattern.endswith("*"):
+                    node = trie
+                    for ch in pattern[:-1]:
+                        node = node.setdefault(ch, {})
+                    node.setdefault(None, []).append(cr)
+                else:
+                    exact.setdefault(pattern, []).append(cr)
+
+        with self.lock:
+            self.rules = compiled
+            self.exact = exact
+            self.trie = trie
+            self.regex_count = len(regexes)
+            if default_score is not None:
+                self.default_score = default_score
+            self.cache.clear()
+            self.generation += 1
+
+    @staticmethod
+    def _parse_target(target):
+        if not target:
+            return None
+        try:
+            net = ipaddress.ip_network(target.strip(), strict=False)
+        except ValueError:
+            return None  # Hostname atau target non-IP
+        return net.version, int(net.network_address), int(net.broadcast_address)
+
+    @staticmethod
+    def _candidates(exact, trie, command):
+        candidates = list(exact.get(command, ()))
+        node = trie
+        for i in range(len(command) + 1):
+            candidates.extend(node.get(None, ()))
+            candidates.extend(cr for regex, cr in node.get("re", ()) if regex.search(command))
+            if i == len(command):
+                break
+            node = node.get(command[i])
+            if node is None:
+                break
+        return candidates
+
+    def decide(self, command, target=""):
+        """Keputusan untuk (command, target): {"score", "rule", "suggestion"}; memo di LRU"""
+        # Input dari JSON bisa berupa angka/null; samakan ke string
+        key = ("" if command is None else str(command), "" if target is None else str(target))
+        with self.lock:
+            decision = self.cache.get(key)
+            if decision is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return decision
+            self.misses += 1
+            # Matcher dan generasi diambil bersamaan agar konsisten dengan rule yang sama
+            exact, trie, default_score, generation = self.exact, self.trie, self.default_score, self.generation
+
+        parsed = self._parse_target(key[1])
+        best = None
+        for cr in self._candidates(exact, trie, key[0]):
+            if cr.matches_target(parsed) and (best is None or cr.score < best.score):
+                best = cr
+        decision = {
+            "score": best.score if best else default_score,
+            "rule": best.name if best else None,
+            "suggestion": best.suggestion if best else None
+        }
+
+        with self.lock:
+            # Rule dimuat ulang selama evaluasi: keputusan lama tidak boleh masuk cache baru
+            if self.generation == generation:
+                self.cache[key] = decision
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return decision
+
+    def get_status(self):
+        """Dapatkan status mesin kebijakan"""
+        return {
+            "rules": len(self.rules),
+            "regex_rules": self.regex_count,
+            "generation": self.generation,
+            "cache_size": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def benchmark(rule_count=10000, evaluations=200000, distinct=5000):
+    """Ukur evaluasi/detik untuk rule set besar, dengan dan tanpa cache"""
+    import random
+    rng = random.Random(42)
+    rules = []
+    for i in range(rule_count):
+        kind = i % 3
+        commands = [f"cmd_{i}"] if kind == 0 else [f"grp{i % 97}_*"] if kind == 1 else [f"re:^op{i % 89}_[0-9]+$"]
+        rule = {"name": f"r{i}", "commands": commands, "score": rng.random()}
+        if i % 2:
+            rule["targets"] = [f"10.{i % 256}.0.0/16"]
+        rules.append(rule)
+    engine = PolicyEngine(rules, cache_size=distinct * 2)
+    queries = [(rng.choice([f"cmd_{rng.randrange(rule_count)}", f"grp{rng.randrange(97)}_x", f"op{rng.randrange(89)}_7"]),
+                f"10.{rng.randrange(256)}.1.{rng.randrange(256)}") for _ in range(distinct)]
+
+    start = time.perf_counter()
+    for command, target in queries:
+        engine.decide(command, target)
+    cold = len(queries) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(evaluations):
+        engine.decide(*queries[i % distinct])
+    warm = evaluations / (time.perf_counter() - start)
+    return {"rules": rule_count, "cold_eval_per_s": round(cold), "cached_eval_per_s": round(warm)}
+
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -0,0 +1,81 @@
+"""
+quantum/profiler.py — Quantum Profiler Module
+Sampling profiler on-demand untuk semua thread, keluaran collapsed-stack (flamegraph)
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def is_project_file(filename):
+    """True untuk file kode proyek (bukan pustaka, termasuk venv di dalam folder proyek)"""
+    return filename.startswith(PROJECT_ROOT) and "site-packages" not in filename
+
+
+def project_frame(frame):
+    """Frame terdalam yang berada di kode proyek; kode pustaka diatribusikan ke pemanggilnya"""
+    innermost = frame
+    while frame is not None:
+        if is_project_file(frame.f_code.co_filename):
+            return frame
+        frame = frame.f_back
+    return innermost
+
+
+def collapse_stack(frame):
+    """Ubah frame menjadi satu baris stack 'file:fungsi;...' dari luar ke dalam"""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class QuantumProfiler:
+    def __init__(self, max_duration=60, max_rate=1000):
+        self.max_duration = max_duration
+        self.max_rate = max_rate
+        self.lock = threading.Lock()  # Hanya satu sesi sampling dalam satu waktu
+        self.last_run = None
+
+    def sample(self, duration=5.0, rate=100):
+        """
+        Sampling stack semua thread selama duration detik dengan rate sampel/detik.
+        Tidak ada overhead saat idle: thread sampler hanya hidup selama sesi berjalan.
+        Mengembalikan (teks collapsed-stack, jumlah sampel), atau None jika sesi lain sedang berjalan.
+        """
+        duration = max(0.1, min(float(duration), self.max_duration))
+        interval = 1.0 / max(1, min(int(rate), self.max_rate))
+        if not self.lock.acquire(blocking=False):
+            return None
+        try:
+            stacks = Counter()
+            samples = 0
+            me = threading.get_ident()
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == me:
+                        continue
+                    stacks[f"{names.get(ident, ident)};{collapse_stack(frame)}"] += 1
+                samples += 1
+                time.sleep(interval)
+            self.last_run = {"time": time.time(), "duration": duration, "samples": samples, "stacks": len(stacks)}
+            text = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+            return text, samples
+        finally:
+            self.lock.release()
+
+    def get_status(self):
+        """Dapatkan status profiler"""
+        return {
+            "running": self.lock.locked(),
+            "last_run": self.last_run
+        }
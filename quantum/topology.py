@@ -0,0 +1,140 @@
+"""
+quantum/topology.py — Quantum Topology Module
+Graf node/edge jaringan agent yang diperbarui secara inkremental dari registry
+"""
+
+import threading
+import uuid
+
+REALITIES = ["PRIMARY", "ALTERNATE_1", "ALTERNATE_2", "FUTURE_72H"]
+STATUS_COLORS = {"active": "#0f0", "stale": "#ffd700"}  # Agent lost dikeluarkan dari graf
+
+
+class QuantumTopology:
+    def __init__(self, max_nodes=500):
+        self.max_nodes = max_nodes  # Di atas batas ini graf dikirim dalam bentuk cluster
+        self.nodes = {}
+        self.edges = {}
+        self.agent_ids = set()
+        self.version = 0
+        self.boot_id = uuid.uuid4().hex[:12]  # Versi hanya bermakna dalam satu boot server
+        self.lock = threading.Lock()
+
+        # Node statis: core dan timeline
+        self.nodes["core"] = {"id": "core", "label": "CORE", "color": "#00b7eb", "size": 30, "shape": "dot"}
+        for tl in REALITIES:
+            self.nodes[tl] = {"id": tl, "label": tl, "color": "#a020f0", "shape": "square", "size": 15}
+            self.edges[f"core:{tl}"] = {"id": f"core:{tl}", "from": "core", "to": tl, "dashes": True}
+
+    @staticmethod
+    def timeline_of(agent):
+        """Tentukan timeline agent dari tanda tangan kuantumnya"""
+        signature = agent.get("quantum_signature") or ""
+        try:
+            return REALITIES[int(signature[:2], 16) % len(REALITIES)]
+        except ValueError:
+            return "PRIMARY"
+
+    def _agent_node(self, agent):
+        consciousness = agent.get("consciousness") or 0.0
+        return {
+            "id": agent["agent_id"],
+            "label": agent["agent_id"][:6],
+            "color": STATUS_COLORS.get(agent.get("status"), "#0f0"),
+            "size": 10 + round(consciousness * 20),
+            "generation": agent.get("generation", 1),
+            "timeline": self.timeline_of(agent)
+        }
+
+    def _agent_edge(self, agent):
+        # Agent hasil replikasi terhubung ke induknya, sisanya ke timeline
+        source = agent.get("parent_id") or self.timeline_of(agent)
+        return {"id": agent["agent_id"], "from": source, "to": agent["agent_id"]}
+
+    def upsert_agent(self, agent):
+        """
+        Tambah atau perbarui agent di graf.
+        Mengembalikan diff {"add", "update", "remove"} atau None jika tidak ada perubahan.
+        """
+        node = self._agent_node(agent)
+        edge = self._agent_edge(agent)
+        diff = {"add": {"nodes": [], "edges": []}, "update": {"nodes": [], "edges": []}, "remove": {"nodes": [], "edges": []}}
+
+        with self.lock:
+            for kind, store, item in (("nodes", self.nodes, node), ("edges", self.edges, edge)):
+                current = store.get(item["id"])
+                if current is None:
+                    diff["add"][kind].append(item)
+                elif current != item:
+                    diff["update"][kind].append(item)
+                else:
+                    continue
+                store[item["id"]] = item
+            self.agent_ids.add(agent["agent_id"])
+            return self._commit(diff)
+
+    def remove_agent(self, agent_id):
+        """Hapus agent dari graf, mengembalikan diff atau None"""
+        with self.lock:
+            if agent_id not in self.agent_ids:
+                return None
+            self.agent_ids.discard(agent_id)
+            self.nodes.pop(agent_id, None)
+            self.edges.pop(agent_id, None)
+            diff = {"add": {"nodes": [], "edges": []}, "update": {"nodes": [], "edges": []},
+                    "remove": {"nodes": [agent_id], "edges": [agent_id]}}
+            return self._commit(diff)
+
+    def _commit(self, diff):
+        if not any(diff[op]["nodes"] or diff[op]["edges"] for op in diff):
+            return None
+        self.version += 1
+        diff["version"] = self.version
+        diff["boot"] = self.boot_id
+        diff["clustered"] = len(self.agent_ids) > self.max_nodes
+        return diff
+
+    def graph(self):
+        """Graf lengkap, atau versi cluster per (timeline, generasi) untuk armada besar"""
+        with self.lock:
+            if len(self.agent_ids) <= self.max_nodes:
+                return {
+                    "version": self.version,
+                    "boot": self.boot_id,
+                    "clustered": False,
+                    "nodes": list(self.nodes.values()),
+                    "edges": list(self.edges.values())
+                }
+
+            # Level-of-detail: satu node cluster per (timeline, generasi)
+            clusters = {}
+            for agent_id in self.agent_ids:
+                node = self.nodes[agent_id]
+                key = (node["timeline"], node["generation"])
+                clusters[key] = clusters.get(key, 0) + 1
+
+            nodes = [n for n in self.nodes.values() if n["id"] not in self.agent_ids]
+            edges = [e for e in self.edges.values() if e["id"] not in self.agent_ids]
+            for (timeline, generation), count in clusters.items():
+                cluster_id = f"cluster:{timeline}:{generation}"
+                nodes.append({
+                    "id": cluster_id,
+                    "label": f"G{generation} × {count}",
+                    "color": "#0f0",
+                    "shape": "hexagon",
+                    "size": min(60, 10 + count ** 0.5),
+                    "count": count
+                })
+                edges.append({"id": cluster_id, "from": timeline, "to": cluster_id})
+
+            return {"version": self.version, "boot": self.boot_id, "clustered": True, "nodes": nodes, "edges": edges}
+
+    def get_status(self):
+        """Dapatkan status graf topologi"""
+        return {
+            "version": self.version,
+            "agents": len(self.agent_ids),
+            "nodes": len(self.nodes),
+            "edges": len(self.edges),
+            "max_nodes": self.max_nodes
+        }
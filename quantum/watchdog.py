@@ -0,0 +1,89 @@
+"""
+quantum/watchdog.py — Quantum Loop Watchdog
+Pengukur lag event loop dan penangkap stack coroutine yang memblokir loop
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from quantum.profiler import PROJECT_ROOT, collapse_stack, project_frame
+
+# Batas atas bucket histogram lag (milidetik); bucket terakhir menampung sisanya
+LAG_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+
+
+class LoopWatchdog:
+    def __init__(self, threshold=0.1, interval=0.05, max_captures=20):
+        self.threshold = threshold  # Loop dianggap terblokir jika lag melebihi ini (detik)
+        self.interval = interval
+        self.histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.max_lag = 0.0
+        self.offenders = Counter()  # Frame terdalam saat loop terblokir -> jumlah
+        self.captures = deque(maxlen=max_captures)
+        self.beat = None
+        self.loop_thread = None
+        self.captured_beat = None
+
+    def start(self, loop):
+        """Mulai heartbeat di event loop dan thread pemantau; panggil dari dalam loop"""
+        self.loop_thread = threading.get_ident()
+        self.beat = time.monotonic()
+        loop.create_task(self._heartbeat())
+        threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True).start()
+
+    async def _heartbeat(self):
+        while True:
+            start = time.monotonic()
+            self.beat = start
+            await asyncio.sleep(self.interval)
+            self._record(max(0.0, time.monotonic() - start - self.interval))
+
+    def _record(self, lag):
+        lag_ms = lag * 1000
+        for i, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+        self.max_lag = max(self.max_lag, lag)
+
+    def _monitor(self):
+        while True:
+            time.sleep(self.threshold / 2)
+            beat = self.beat
+            blocked = time.monotonic() - beat - self.interval
+            # Satu tangkapan per blokade: beat yang sama tidak ditangkap dua kali
+            if blocked < self.threshold or beat == self.captured_beat:
+                continue
+            frame = sys._current_frames().get(self.loop_thread)
+            if frame is None:
+                continue
+            self.captured_beat = beat
+            # Pelaku = fungsi proyek terdalam (handler/coroutine), dihitung per fungsi bukan per baris
+            culprit = project_frame(frame)
+            filename = os.path.relpath(culprit.f_code.co_filename, PROJECT_ROOT).replace(os.sep, "/")
+            offender = f"{filename}:{culprit.f_code.co_name}"
+            self.offenders[offender] += 1
+            self.captures.append({
+                "time": time.time(),
+                "blocked_ms": round(blocked * 1000, 1),
+                "offender": offender,
+                "line": culprit.f_lineno,
+                "stack": collapse_stack(frame)
+            })
+
+    def get_status(self):
+        """Dapatkan histogram lag, pelaku terbanyak, dan tangkapan stack terakhir"""
+        labels = [f"<={b}ms" for b in LAG_BUCKETS_MS] + [f">{LAG_BUCKETS_MS[-1]}ms"]
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "histogram": dict(zip(labels, self.histogram)),
+            "offenders": dict(self.offenders.most_common(10)),
+            "captures": list(self.captures)
+        }